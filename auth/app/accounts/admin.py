@@ -4,10 +4,45 @@ Configuration Django Admin pour le module d'authentification.
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.contrib.postgres.search import SearchQuery
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from .models import User
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginateur qui estime le total des pages non filtrées.
+
+    Le paginateur standard exécute SELECT COUNT(*) à chaque page, ce qui
+    parcourt toute la table. Pour une liste sans filtre sous PostgreSQL,
+    les statistiques du planificateur (pg_class.reltuples) donnent une
+    estimation en une lecture d'une seule ligne. Les listes filtrées et
+    les autres moteurs gardent le comptage exact.
+    """
+
+    @cached_property
+    def count(self):
+        """Retourne le nombre (estimé si possible) d'objets."""
+        if (
+            connection.vendor == 'postgresql' and
+            hasattr(self.object_list, 'query') and
+            not self.object_list.query.where
+        ):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            # reltuples vaut -1 tant que la table n'a jamais été analysée
+            if row is not None and row[0] >= 0:
+                return int(row[0])
+        return super().count
+
+
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     """
@@ -29,6 +64,17 @@ class CustomUserAdmin(UserAdmin):
     
     # Champs en lecture seule
     readonly_fields = ('created_at', 'updated_at', 'last_login')
+
+    # Suivre les clés étrangères en une seule requête JOINée dans la liste
+    # (évite les requêtes N+1 si un champ relationnel est ajouté à list_display)
+    list_select_related = True
+
+    # Estimation du total via les statistiques PostgreSQL plutôt qu'un
+    # COUNT(*) complet à chaque page
+    paginator = EstimatedCountPaginator
+
+    # Ne pas exécuter le COUNT(*) supplémentaire non filtré lors d'une recherche
+    show_full_result_count = False
     
     # Sections du formulaire d'édition
     fieldsets = (
@@ -61,23 +107,101 @@ class CustomUserAdmin(UserAdmin):
     
     # Actions personnalisées
     actions = ['activate_users', 'deactivate_users', 'block_users', 'unblock_users']
+
+    def get_queryset(self, request):
+        """
+        Restreint les colonnes chargées pour la liste des utilisateurs.
+
+        La changelist ne rend que les champs de list_display; charger les
+        colonnes larges (bio, address, avatar...) gonfle inutilement chaque
+        ligne renvoyée par la base. La restriction ne s'applique qu'à la
+        changelist: le formulaire d'édition rend password, bio, avatar...
+        et chaque colonne différée y coûterait un SELECT de rechargement.
+        Les autres vues ne diffèrent que le vecteur de recherche (jamais
+        affiché).
+        """
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match is not None and match.url_name == 'accounts_user_changelist':
+            return queryset.only(
+                'id', 'email', 'username', 'role',
+                'is_active', 'is_blocked', 'created_at'
+            )
+        return queryset.defer('search_vector')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Recherche optimisée utilisant les index existants.
+
+        search_fields génère des requêtes icontains (LIKE '%q%') coûteuses.
+        Pour les termes simples, on dispatche vers des lookups exacts ou par
+        préfixe qui exploitent les index B-tree (email/username uniques):
+        - terme contenant '@' -> recherche exacte sur l'email
+        - terme entièrement numérique (hors '+') -> recherche exacte du téléphone
+        - terme simple -> préfixe sur le nom d'utilisateur
+        Les requêtes multi-termes retombent sur la recherche standard.
+        """
+        term = search_term.strip()
+
+        # Termes vides ou multi-mots: recherche plein texte sur le vecteur
+        # pré-calculé sous PostgreSQL, recherche standard sinon
+        if not term or ' ' in term:
+            if term and connection.vendor == 'postgresql':
+                query = SearchQuery(term, config='simple')
+                return queryset.filter(search_vector=query), False
+            return super().get_search_results(request, queryset, search_term)
+
+        # Email exact (insensible à la casse, index unique sur email)
+        if '@' in term:
+            return queryset.filter(email__iexact=term), False
+
+        # Numéro de téléphone exact (avec ou sans indicatif '+')
+        if term.lstrip('+').isdigit():
+            return queryset.filter(phone_number=term), False
+
+        # Préfixe sur le nom d'utilisateur (index unique sur username)
+        return queryset.filter(username__istartswith=term), False
     
+    def _bulk_flag(self, queryset, field, value, batch_size=5000):
+        """
+        Met à jour un booléen en masse, par lots et sans ré-écrire les
+        lignes déjà correctes.
+
+        Le pré-filtre saute les lignes dont la valeur est déjà bonne (moins
+        d'écritures WAL et de mises à jour d'index), et le découpage en lots
+        limite la durée pendant laquelle chaque UPDATE garde ses verrous.
+
+        Args:
+            queryset: Sélection de l'admin
+            field: Nom du champ booléen à modifier
+            value: Valeur cible
+            batch_size: Taille des lots d'UPDATE
+
+        Returns:
+            int: Nombre de lignes réellement modifiées
+        """
+        return User.objects.bulk_set(
+            queryset.filter(**{field: not value}),
+            batch_size=batch_size,
+            **{field: value}
+        )
+
     def activate_users(self, request, queryset):
         """Active les utilisateurs sélectionnés."""
-        queryset.update(is_active=True)
+        self._bulk_flag(queryset, 'is_active', True)
     activate_users.short_description = _('Activer les utilisateurs sélectionnés')
-    
+
     def deactivate_users(self, request, queryset):
         """Désactive les utilisateurs sélectionnés."""
-        queryset.update(is_active=False)
+        self._bulk_flag(queryset, 'is_active', False)
     deactivate_users.short_description = _('Désactiver les utilisateurs sélectionnés')
-    
+
     def block_users(self, request, queryset):
         """Bloque les utilisateurs sélectionnés."""
-        queryset.update(is_blocked=True)
+        self._bulk_flag(queryset, 'is_blocked', True)
     block_users.short_description = _('Bloquer les utilisateurs sélectionnés')
-    
+
     def unblock_users(self, request, queryset):
         """Débloque les utilisateurs sélectionnés."""
-        queryset.update(is_blocked=False)
+        self._bulk_flag(queryset, 'is_blocked', False)
     unblock_users.short_description = _('Débloquer les utilisateurs sélectionnés')
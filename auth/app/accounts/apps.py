@@ -23,7 +23,20 @@ class AccountsConfig(AppConfig):
     def ready(self):
         """
         Méthode appelée quand l'application est prête.
-        Importe les signaux pour les enregistrer.
+        Importe les signaux et préchauffe les structures paresseuses.
         """
         # Importer les signaux pour les enregistrer avec Django
         from . import signals  # noqa: F401
+
+        # Préchauffer la compilation ORM et les champs des sérialiseurs:
+        # la première requête n'a plus à payer la génération du SQL ni
+        # la construction des champs DRF. Sous gunicorn --preload, ces
+        # structures sont bâties dans le master et partagées en
+        # copy-on-write par les workers forkés. Aucune requête n'est
+        # exécutée (str(query) ne touche pas la base).
+        from .models import User
+        from .serializers import UserListSerializer, UserSerializer
+
+        str(User.objects.all().query)
+        UserSerializer().fields
+        UserListSerializer().fields
@@ -0,0 +1,83 @@
+"""
+Classes d'authentification personnalisées pour le module d'authentification.
+Optimise le chargement de l'utilisateur sur les requêtes authentifiées.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# Durée de vie (secondes) de l'entrée de cache par utilisateur. Les
+# chemins d'écriture connus purgent l'entrée eux-mêmes (signals.py pour
+# save(), UserManager.bulk_set pour les actions admin en masse); le TTL
+# borne la fenêtre de péremption pour tout autre UPDATE direct qui
+# contournerait ces deux chemins.
+USER_CACHE_TTL = getattr(settings, 'AUTH_USER_CACHE_TTL', 300)
+
+
+def user_cache_key(user_id):
+    """Clé de cache de l'utilisateur authentifié."""
+    return f'accounts:auth_user:{user_id}'
+
+
+class LightweightJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT qui ne charge pas les colonnes larges du profil.
+
+    Les vérifications de permissions ne lisent que le rôle et les booléens
+    de statut; charger `bio`, `address` et `avatar` (champs texte non
+    bornés) sur chaque requête authentifiée gonfle inutilement le SELECT.
+    Ces colonnes restent accessibles: Django les chargera à la demande si
+    une vue de détail les sérialise.
+
+    L'instance allégée est de plus mise en cache quelques minutes (Redis
+    en production, mémoire locale sinon): les rafales de requêtes d'un
+    même client ne déclenchent alors aucun SELECT utilisateur. L'entrée
+    est invalidée par les chemins d'écriture: save() via signals.py et
+    les mises à jour en masse via UserManager.bulk_set. Un UPDATE direct
+    hors de ces chemins ne purge rien et reste visible jusqu'au TTL.
+    """
+
+    # Colonnes larges inutiles pour l'authentification et les permissions
+    # (search_vector n'est lu que par la recherche admin)
+    DEFERRED_FIELDS = ('bio', 'address', 'avatar', 'search_vector')
+
+    def get_user(self, validated_token):
+        """
+        Récupère l'utilisateur du token, depuis le cache si possible.
+
+        Args:
+            validated_token: Le token JWT validé
+
+        Returns:
+            User: L'utilisateur authentifié (colonnes larges différées)
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Le token ne contient aucune identification utilisateur reconnaissable.')
+            )
+
+        cache_key = user_cache_key(user_id)
+        user = cache.get(cache_key)
+        if user is None:
+            try:
+                user = self.user_model.objects.defer(*self.DEFERRED_FIELDS).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(
+                    _('Utilisateur non trouvé.'), code='user_not_found'
+                )
+            cache.set(cache_key, user, USER_CACHE_TTL)
+
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('Le compte utilisateur est désactivé.'), code='user_inactive'
+            )
+
+        return user
@@ -0,0 +1,59 @@
+"""
+Index trigram GIN pour la recherche admin (PostgreSQL uniquement).
+
+La recherche admin (search_fields) génère des requêtes LIKE '%q%' qui ne
+peuvent pas utiliser un index B-tree classique. Les index GIN avec l'opclass
+gin_trgm_ops permettent à PostgreSQL de satisfaire ces requêtes par un
+parcours d'index au lieu d'un scan séquentiel complet.
+
+Les opérations sont ignorées sur les autres moteurs (SQLite en développement)
+qui ne supportent ni CREATE EXTENSION ni les index GIN.
+"""
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class TrigramExtensionIfPostgres(TrigramExtension):
+    """Installe l'extension pg_trgm, uniquement sous PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddIndexIfPostgres(migrations.AddIndex):
+    """Crée l'index en base uniquement sous PostgreSQL (l'état Django est mis à jour partout)."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        # L'extension pg_trgm doit exister avant la création des index GIN
+        TrigramExtensionIfPostgres(),
+        AddIndexIfPostgres(
+            model_name='user',
+            index=GinIndex(fields=['email'], name='user_email_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexIfPostgres(
+            model_name='user',
+            index=GinIndex(fields=['username'], name='user_username_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,80 @@
+"""
+Conversion du rôle utilisateur de texte vers entier.
+
+'admin'/'moderator'/'user' étaient stockés en texte à longueur variable;
+chaque vérification de permission comparait des chaînes. Le rôle est
+désormais un PositiveSmallIntegerField (0=user, 1=moderator, 2=admin):
+lignes plus étroites, comparaisons entières, et une contrainte CHECK
+garantit que seules les valeurs connues sont écrites.
+
+L'index composite (role, is_active, is_blocked) est supprimé puis recréé
+autour du remplacement de colonne.
+"""
+
+from django.db import migrations, models
+
+
+# Correspondance ancienne valeur texte -> nouvelle valeur entière
+ROLE_MAP = {'user': 0, 'moderator': 1, 'admin': 2}
+
+
+def roles_to_int(apps, schema_editor):
+    """Copie les rôles texte vers la nouvelle colonne entière."""
+    User = apps.get_model('accounts', 'User')
+    for old, new in ROLE_MAP.items():
+        User.objects.filter(role=old).update(role_int=new)
+
+
+def roles_to_str(apps, schema_editor):
+    """Restaure les rôles texte depuis la colonne entière (migration arrière)."""
+    User = apps.get_model('accounts', 'User')
+    for old, new in ROLE_MAP.items():
+        User.objects.filter(role_int=new).update(role=old)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_user_role_active_blk_user_user_created_desc'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_role_active_blk',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='role_int',
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, 'Utilisateur'), (1, 'Moderateur'), (2, 'Admin')],
+                default=0,
+                help_text="Rôle utilisateur pour le contrôle d'accès.",
+                verbose_name='Rôle',
+            ),
+        ),
+        migrations.RunPython(roles_to_int, roles_to_str),
+        migrations.RemoveField(
+            model_name='user',
+            name='role',
+        ),
+        migrations.RenameField(
+            model_name='user',
+            old_name='role_int',
+            new_name='role',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(
+                fields=['role', 'is_active', 'is_blocked'],
+                name='user_role_active_blk',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.CheckConstraint(
+                check=models.Q(role__in=[0, 1, 2]),
+                name='valid_role',
+            ),
+        ),
+    ]
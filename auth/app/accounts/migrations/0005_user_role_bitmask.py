@@ -0,0 +1,59 @@
+"""
+Passage des rôles entiers à des valeurs en masque binaire.
+
+Les rôles (0=user, 1=moderator, 2=admin) deviennent des puissances de 2
+(1=user, 2=moderator, 4=admin): un contrôle de type «modérateur ou admin»
+se fait désormais avec un seul ET binaire (role & 6) plutôt qu'un test
+d'appartenance à une liste.
+
+Le remappage des données s'effectue en ordre décroissant pour ne pas
+écraser des valeurs déjà converties (2->4 avant 1->2 avant 0->1).
+"""
+
+from django.db import migrations, models
+
+
+def roles_to_bitmask(apps, schema_editor):
+    """Remappe 0/1/2 vers 1/2/4 (en ordre décroissant, sans collision)."""
+    User = apps.get_model('accounts', 'User')
+    for old, new in ((2, 4), (1, 2), (0, 1)):
+        User.objects.filter(role=old).update(role=new)
+
+
+def roles_from_bitmask(apps, schema_editor):
+    """Restaure 1/2/4 vers 0/1/2 (en ordre croissant, sans collision)."""
+    User = apps.get_model('accounts', 'User')
+    for old, new in ((1, 0), (2, 1), (4, 2)):
+        User.objects.filter(role=old).update(role=new)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_role_integer'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='user',
+            name='valid_role',
+        ),
+        migrations.RunPython(roles_to_bitmask, roles_from_bitmask),
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, 'Utilisateur'), (2, 'Moderateur'), (4, 'Admin')],
+                default=1,
+                help_text="Rôle utilisateur pour le contrôle d'accès.",
+                verbose_name='Rôle',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.CheckConstraint(
+                check=models.Q(role__in=[1, 2, 4]),
+                name='valid_role',
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-09-01 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_role_bitmask'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_blocked', True)), fields=['created_at'], name='idx_blocked_users'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_email_verified', False)), fields=['created_at'], name='idx_unverified_users'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-09-01 00:05
+
+import app.accounts.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_user_idx_blocked_users_user_idx_unverified_users'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', app.accounts.models.UserManager()),
+            ],
+        ),
+    ]
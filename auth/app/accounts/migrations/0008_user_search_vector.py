@@ -0,0 +1,91 @@
+"""
+Vecteur de recherche plein texte pour la recherche admin combinée.
+
+Ajoute une colonne tsvector maintenue par un trigger PostgreSQL à partir
+de l'email, du nom d'utilisateur et du téléphone, avec un index GIN. La
+recherche multi-termes devient un parcours d'index sur un vecteur
+pré-calculé au lieu d'une tokenisation par requête.
+
+L'index GIN et le trigger sont ignorés hors PostgreSQL (SQLite accepte la
+colonne telle quelle mais ne la remplit pas).
+"""
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import migrations
+
+
+class AddIndexIfPostgres(migrations.AddIndex):
+    """Crée l'index en base uniquement sous PostgreSQL (l'état Django est mis à jour partout)."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class RunSQLIfPostgres(migrations.RunSQL):
+    """Exécute le SQL uniquement sous PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+# Expression commune au trigger et au remplissage initial
+SEARCH_VECTOR_SQL = (
+    "to_tsvector('simple', coalesce(email, '') || ' ' || "
+    "coalesce(username, '') || ' ' || coalesce(phone_number, ''))"
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_vector',
+            field=SearchVectorField(
+                editable=False, null=True, verbose_name='Vecteur de recherche'
+            ),
+        ),
+        AddIndexIfPostgres(
+            model_name='user',
+            index=GinIndex(fields=['search_vector'], name='user_search_gin'),
+        ),
+        RunSQLIfPostgres(
+            sql=f"""
+            CREATE FUNCTION accounts_user_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := to_tsvector('simple',
+                    coalesce(NEW.email, '') || ' ' ||
+                    coalesce(NEW.username, '') || ' ' ||
+                    coalesce(NEW.phone_number, ''));
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER accounts_user_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF email, username, phone_number
+            ON accounts_user
+            FOR EACH ROW EXECUTE FUNCTION accounts_user_search_vector_update();
+
+            UPDATE accounts_user SET search_vector = {SEARCH_VECTOR_SQL};
+            """,
+            reverse_sql="""
+            DROP TRIGGER accounts_user_search_vector_trigger ON accounts_user;
+            DROP FUNCTION accounts_user_search_vector_update();
+            """,
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-09-01 00:07
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+import django.db.models.functions.text
+
+
+def lowercase_emails(apps, schema_editor):
+    """Normalise les emails existants avant de poser la contrainte."""
+    User = apps.get_model('accounts', 'User')
+    User.objects.exclude(email=Lower('email')).update(email=Lower('email'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='unique_lower_email'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-09-01 00:08
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_user_unique_lower_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailTokenRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(db_index=True, max_length=254, verbose_name='Email')),
+                ('kind', models.CharField(choices=[('reset', 'Réinitialisation de mot de passe'), ('verify', "Vérification d'email")], max_length=10, verbose_name='Type')),
+                ('token', models.CharField(blank=True, max_length=255, null=True, verbose_name='Token')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Créé le')),
+            ],
+            options={
+                'verbose_name': 'Demande de token par email',
+                'verbose_name_plural': 'Demandes de token par email',
+                'ordering': ['-created_at'],
+                'indexes': [django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='emailtoken_created_brin')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='emailtokenrequest',
+            constraint=models.UniqueConstraint(fields=('kind', 'token'), name='unique_kind_token'),
+        ),
+    ]
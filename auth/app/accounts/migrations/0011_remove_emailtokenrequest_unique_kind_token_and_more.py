@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-09-01 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_emailtokenrequest_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='emailtokenrequest',
+            name='unique_kind_token',
+        ),
+        migrations.RemoveField(
+            model_name='emailtokenrequest',
+            name='token',
+        ),
+        migrations.AddField(
+            model_name='emailtokenrequest',
+            name='token_hash',
+            field=models.BinaryField(max_length=32, null=True, unique=True, verbose_name='Empreinte du token'),
+        ),
+    ]
@@ -3,11 +3,72 @@ Modèles de données pour le module d'authentification.
 Ce module définit le modèle utilisateur personnalisé avec tous les champs nécessaires.
 """
 
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as DjangoUserManager
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 
 
+class UserManager(DjangoUserManager):
+    """
+    Manager personnalisé pour le modèle User.
+
+    Ajoute des aides pour les écritures en masse. Pour les mises à jour
+    multi-champs sur des instances déjà chargées, préférer
+    User.objects.bulk_update(users, fields=[...], batch_size=1000): une
+    seule requête CASE WHEN au lieu d'un UPDATE par ligne. De même, les
+    sauvegardes individuelles doivent passer update_fields=[...] pour ne
+    ré-écrire que les colonnes modifiées.
+    """
+
+    def _create_user(self, username, email, password, **extra_fields):
+        # is_staff est une propriété dérivée du rôle sur ce modèle:
+        # ignorer la valeur que le manager de Django tente d'affecter
+        extra_fields.pop('is_staff', None)
+        return super()._create_user(username, email, password, **extra_fields)
+
+    def create_superuser(self, username=None, email=None, password=None, **extra_fields):
+        # Un superutilisateur est nécessairement admin (is_staff dérivé)
+        extra_fields.setdefault('role', self.model.Role.ADMIN)
+        return super().create_superuser(username, email, password, **extra_fields)
+
+    def bulk_set(self, queryset, batch_size=1000, **fields):
+        """
+        Applique les mêmes valeurs à toutes les lignes d'un queryset,
+        par lots.
+
+        Le découpage en lots limite la durée des verrous de ligne sur les
+        grandes sélections.
+
+        update() ne déclenche aucun signal post_save: l'invalidation du
+        cache d'authentification faite par signals.py ne s'applique pas
+        ici. Chaque lot purge donc lui-même les entrées concernées, pour
+        qu'un blocage ou une désactivation en masse prenne effet dès la
+        requête suivante et non à l'expiration du TTL.
+
+        Args:
+            queryset: Les utilisateurs à mettre à jour
+            batch_size: Taille des lots d'UPDATE
+            **fields: Paires champ=valeur à écrire
+
+        Returns:
+            int: Nombre de lignes mises à jour
+        """
+        # Import local: models est chargé avant que la pile simplejwt
+        # importée par authentication ne soit disponible
+        from .authentication import user_cache_key
+
+        ids = list(queryset.values_list('id', flat=True))
+        for i in range(0, len(ids), batch_size):
+            batch = ids[i:i + batch_size]
+            self.filter(id__in=batch).update(**fields)
+            cache.delete_many([user_cache_key(pk) for pk in batch])
+        return len(ids)
+
+
 class User(AbstractUser):
     """
     Modèle utilisateur personnalisé pour l'authentification.
@@ -22,11 +83,17 @@ class User(AbstractUser):
     - Statut de blocage
     """
     
-    class Role(models.TextChoices):
-        # Définition des rôles disponibles pour les utilisateurs
-        ADMIN = 'admin', _('Admin')
-        MODERATOR = 'moderator', _('Moderateur')
-        USER = 'user', _('Utilisateur')
+    class Role(models.IntegerChoices):
+        # Définition des rôles disponibles pour les utilisateurs.
+        # Valeurs en puissances de 2: les vérifications de permissions
+        # peuvent tester un ensemble de rôles avec un seul ET binaire
+        # (ex: role & (MODERATOR | ADMIN)) au lieu d'un test d'appartenance.
+        USER = 1, _('Utilisateur')
+        MODERATOR = 2, _('Moderateur')
+        ADMIN = 4, _('Admin')
+
+    # Masque des rôles considérés comme membres du personnel
+    STAFF_ROLES = Role.MODERATOR | Role.ADMIN
     
     class Meta:
         # Configuration du modèle pour Django Admin
@@ -34,6 +101,49 @@ class User(AbstractUser):
         verbose_name_plural = _('Utilisateurs')
         # Tri par défaut: du plus récent au plus ancien
         ordering = ['-created_at']
+        # Index trigram GIN (PostgreSQL) pour accélérer la recherche admin.
+        # search_fields génère des requêtes icontains (LIKE '%q%') qui, sans
+        # ces index, provoquent un scan séquentiel complet de la table.
+        indexes = [
+            GinIndex(name='user_email_trgm', fields=['email'], opclasses=['gin_trgm_ops']),
+            GinIndex(name='user_username_trgm', fields=['username'], opclasses=['gin_trgm_ops']),
+            # Index composite couvrant les filtres admin et les vérifications
+            # de permissions (rôle + statuts)
+            models.Index(fields=['role', 'is_active', 'is_blocked'], name='user_role_active_blk'),
+            # Satisfait ordering = ['-created_at'] sans étape de tri
+            models.Index(fields=['-created_at'], name='user_created_desc'),
+            # Index partiels: un index complet sur un booléen est inutile
+            # (faible cardinalité), mais un index restreint aux lignes
+            # bloquées / non vérifiées reste minuscule et rend ces
+            # recherches proportionnelles au nombre de lignes concernées
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(is_blocked=True),
+                name='idx_blocked_users',
+            ),
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(is_email_verified=False),
+                name='idx_unverified_users',
+            ),
+            # Index GIN (PostgreSQL) sur le vecteur de recherche plein texte
+            GinIndex(fields=['search_vector'], name='user_search_gin'),
+        ]
+        # Garde-fou base de données: seules les valeurs de rôle connues
+        # peuvent être écrites
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(role__in=[1, 2, 4]),
+                name='valid_role',
+            ),
+            # Index fonctionnel unique sur lower(email): la connexion peut
+            # faire une recherche insensible à la casse via un parcours
+            # d'index au lieu d'un scan séquentiel iexact
+            models.UniqueConstraint(
+                models.functions.Lower('email'),
+                name='unique_lower_email',
+            ),
+        ]
     
     # ==================== Champs d'authentification ====================
     # Nom d'utilisateur unique (150 caractères max)
@@ -105,8 +215,7 @@ class User(AbstractUser):
     
     # ==================== Contrôle d'accès par rôle ====================
     # Rôle de l'utilisateur pour le contrôle d'accès
-    role = models.CharField(
-        max_length=20,
+    role = models.PositiveSmallIntegerField(
         choices=Role.choices,
         default=Role.USER,
         verbose_name=_('Rôle'),
@@ -135,6 +244,16 @@ class User(AbstractUser):
         help_text=_('Indique si ce compte est bloqué.')
     )
     
+    # ==================== Recherche plein texte ====================
+    # Vecteur de recherche combiné (email + username + téléphone),
+    # maintenu par un trigger PostgreSQL à l'écriture. Pré-calculer le
+    # tsvector évite la tokenisation à chaque recherche admin.
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name=_('Vecteur de recherche')
+    )
+
     # ==================== Champs de date/horodatage ====================
     # Dernière connexion
     last_login = models.DateTimeField(
@@ -156,11 +275,45 @@ class User(AbstractUser):
     )
     
     # ==================== Configuration Django ====================
+    # Manager personnalisé (aides pour les écritures en masse)
+    objects = UserManager()
+
     # Utiliser l'email comme champ d'identification
     USERNAME_FIELD = 'email'
     # Champs requis lors de la création (en plus de l'email et password)
     REQUIRED_FIELDS = ['username']
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Charge l'instance en capturant les valeurs d'origine du rôle et
+        des statuts.
+
+        Le diff effectué dans les signaux (signals.py) disposait jusqu'ici
+        d'un SELECT supplémentaire par sauvegarde; capturer les valeurs au
+        chargement rend ce diff gratuit. Les champs différés sont ignorés
+        (y accéder déclencherait justement une requête).
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'role' in field_names:
+            instance._original_role = instance.role
+        if 'is_active' in field_names:
+            instance._original_is_active = instance.is_active
+        if 'is_blocked' in field_names:
+            instance._original_is_blocked = instance.is_blocked
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Sauvegarde l'utilisateur en normalisant l'email en minuscules.
+
+        La normalisation à l'écriture permet aux recherches de connexion
+        de comparer en égalité stricte (indexée) plutôt qu'en iexact.
+        """
+        if self.email:
+            self.email = self.email.lower()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """
         Représentation string de l'utilisateur.
@@ -177,8 +330,70 @@ class User(AbstractUser):
     def is_moderator(self):
         """Vérifie si l'utilisateur est modérateur."""
         return self.role == self.Role.MODERATOR
-    
+
     @property
     def is_staff(self):
         """Vérifie si l'utilisateur est staff (admin ou modérateur)."""
-        return self.role in [self.Role.ADMIN, self.Role.MODERATOR]
+        return bool(self.role & self.STAFF_ROLES)
+
+
+class EmailTokenRequest(models.Model):
+    """
+    Demande de token envoyée par email (réinitialisation ou vérification).
+
+    Une seule table pour tous les types de demandes: schéma identique
+    (email, token, horodatage), partitionnée logiquement par `kind`. Les
+    lignes sont en append-only; un index BRIN sur created_at (PostgreSQL)
+    reste minuscule et suffit au nettoyage TTL en masse
+    (DELETE WHERE created_at < ...).
+    """
+
+    class Kind(models.TextChoices):
+        # Types de demandes de token
+        RESET = 'reset', _('Réinitialisation de mot de passe')
+        VERIFY = 'verify', _('Vérification d\'email')
+
+    class Meta:
+        verbose_name = _('Demande de token par email')
+        verbose_name_plural = _('Demandes de token par email')
+        ordering = ['-created_at']
+        indexes = [
+            # Index BRIN (PostgreSQL): idéal pour une colonne croissante
+            # en append-only, ~1000x plus petit qu'un B-tree
+            BrinIndex(fields=['created_at'], name='emailtoken_created_brin'),
+        ]
+
+    # Adresse email destinataire de la demande
+    email = models.EmailField(
+        db_index=True,
+        verbose_name=_('Email')
+    )
+
+    # Type de demande (réinitialisation ou vérification)
+    kind = models.CharField(
+        max_length=10,
+        choices=Kind.choices,
+        verbose_name=_('Type')
+    )
+
+    # Empreinte SHA-256 du token (32 octets, jamais le token en clair).
+    # Largeur fixe: comparaison et index plus compacts qu'un texte de
+    # longueur variable, et une fuite de la base ne révèle aucun token
+    # utilisable.
+    token_hash = models.BinaryField(
+        max_length=32,
+        null=True,
+        unique=True,
+        editable=False,
+        verbose_name=_('Empreinte du token')
+    )
+
+    # Date de création (automatique)
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Créé le')
+    )
+
+    def __str__(self):
+        """Représentation string de la demande."""
+        return f'{self.kind}: {self.email}'
@@ -3,72 +3,91 @@ Permissions personnalisées pour le module d'authentification.
 Permissions basées sur les rôles et les fonctionnalités.
 """
 
-from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, BasePermission, IsAuthenticated
 from django.utils.translation import gettext_lazy as _
 
+from .models import User
 
-class IsAdmin(BasePermission):
+
+class _CachedUserMixin:
     """
-    Classe de permission pour les administrateurs.
-    Autorise l'accès uniquement aux utilisateurs avec le rôle admin.
+    Mixin qui mémorise l'utilisateur résolu sur la requête.
+
+    request.user est un SimpleLazyObject: chaque classe de permission d'une
+    pile (ex: UserPermissions.verified()) peut re-déclencher la résolution
+    de l'utilisateur. On le résout une seule fois par requête et on
+    réutilise l'instance pour toutes les vérifications suivantes.
     """
-    
-    # Message d'erreur affiché si l'accès est refusé
-    message = _('Vous devez être administrateur pour effectuer cette action.')
-    
-    def has_permission(self, request, view):
-        """
-        Vérifie si l'utilisateur est authentifié et est admin.
-        
-        Args:
-            request: La requête HTTP
-            view: La vue concernée
-        
-        Returns:
-            bool: True si l'utilisateur est admin, False sinon
-        """
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.role == 'admin'
-        )
 
+    def _user(self, request):
+        """Retourne l'utilisateur résolu, mis en cache sur la requête."""
+        if not hasattr(request, '_cached_auth_user'):
+            request._cached_auth_user = request.user
+        return request._cached_auth_user
 
-class IsModerator(BasePermission):
-    """
-    Classe de permission pour les modérateurs.
-    Autorise l'accès aux utilisateurs avec rôle modérateur ou admin.
+
+def role_permission(mask, name, doc, message):
     """
-    
-    message = _('Vous devez être modérateur pour effectuer cette action.')
-    
-    def has_permission(self, request, view):
-        """Vérifie si l'utilisateur est modérateur ou admin."""
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.role in ['moderator', 'admin']
-        )
+    Fabrique une classe de permission pour un ensemble de rôles.
 
+    Les classes de rôle ne diffèrent que par le masque de rôles autorisé;
+    les générer en un seul endroit fige le masque dans une fermeture et
+    centralise le schéma de vérification (résolution unique de
+    l'utilisateur, ET binaire sur le masque) — une optimisation future
+    profite à toutes les classes de rôle.
 
-class IsStaff(BasePermission):
-    """
-    Classe de permission pour le personnel.
-    Autorise l'accès aux utilisateurs avec rôle modérateur ou admin.
+    Args:
+        mask: Masque binaire des rôles autorisés
+        name: Nom de la classe générée (introspection DRF)
+        doc: Docstring de la classe générée
+        message: Message d'erreur si l'accès est refusé
+
+    Returns:
+        type: Classe de permission DRF
     """
-    
-    message = _('Vous devez être membre du personnel pour effectuer cette action.')
-    
-    def has_permission(self, request, view):
-        """Vérifie si l'utilisateur fait partie du staff."""
-        return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.role in ['moderator', 'admin']
-        )
 
+    class RolePermission(_CachedUserMixin, BasePermission):
+
+        def has_permission(self, request, view):
+            """Vérifie que le rôle de l'utilisateur figure dans le masque."""
+            user = self._user(request)
+            return bool(
+                user and
+                user.is_authenticated and
+                user.role & mask
+            )
+
+    RolePermission.__name__ = name
+    RolePermission.__qualname__ = name
+    RolePermission.__doc__ = doc
+    RolePermission.message = message
+    return RolePermission
+
+
+# Classes de permission par rôle, générées une fois à l'import
+IsAdmin = role_permission(
+    User.Role.ADMIN,
+    'IsAdmin',
+    "Autorise l'accès uniquement aux utilisateurs avec le rôle admin.",
+    _('Vous devez être administrateur pour effectuer cette action.'),
+)
+
+IsModerator = role_permission(
+    User.STAFF_ROLES,
+    'IsModerator',
+    "Autorise l'accès aux utilisateurs avec rôle modérateur ou admin.",
+    _('Vous devez être modérateur pour effectuer cette action.'),
+)
 
-class IsActive(BasePermission):
+IsStaff = role_permission(
+    User.STAFF_ROLES,
+    'IsStaff',
+    "Autorise l'accès aux utilisateurs avec rôle modérateur ou admin.",
+    _('Vous devez être membre du personnel pour effectuer cette action.'),
+)
+
+
+class IsActive(_CachedUserMixin, BasePermission):
     """
     Classe de permission pour les utilisateurs actifs.
     Vérifie si le compte utilisateur est actif.
@@ -78,14 +97,15 @@ class IsActive(BasePermission):
     
     def has_permission(self, request, view):
         """Vérifie si le compte est actif."""
+        user = self._user(request)
         return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.is_active
+            user and
+            user.is_authenticated and
+            user.is_active
         )
 
 
-class IsNotBlocked(BasePermission):
+class IsNotBlocked(_CachedUserMixin, BasePermission):
     """
     Classe de permission pour les utilisateurs non bloqués.
     Vérifie si le compte utilisateur n'est pas bloqué.
@@ -95,14 +115,15 @@ class IsNotBlocked(BasePermission):
     
     def has_permission(self, request, view):
         """Vérifie que le compte n'est pas bloqué."""
+        user = self._user(request)
         return (
-            request.user and
-            request.user.is_authenticated and
-            not request.user.is_blocked
+            user and
+            user.is_authenticated and
+            not user.is_blocked
         )
 
 
-class IsVerified(BasePermission):
+class IsVerified(_CachedUserMixin, BasePermission):
     """
     Classe de permission pour les utilisateurs vérifiés.
     Vérifie si l'utilisateur a vérifié son email.
@@ -112,10 +133,34 @@ class IsVerified(BasePermission):
     
     def has_permission(self, request, view):
         """Vérifie que l'email est vérifié."""
+        user = self._user(request)
         return (
-            request.user and
-            request.user.is_authenticated and
-            request.user.is_email_verified
+            user and
+            user.is_authenticated and
+            user.is_email_verified
+        )
+
+
+class IsAuthenticatedActiveVerified(_CachedUserMixin, BasePermission):
+    """
+    Permission composite: authentifié, actif, vérifié et non bloqué.
+
+    Remplace la pile [IsAuthenticated, IsActive, IsVerified] par une seule
+    classe: DRF appelle has_permission sur chaque classe de la pile, donc
+    une classe unique évite les appels et résolutions d'utilisateur répétés.
+    """
+
+    message = _('Votre compte doit être actif et vérifié pour accéder à cette ressource.')
+
+    def has_permission(self, request, view):
+        """Vérifie tous les prérequis du compte en un seul passage."""
+        user = self._user(request)
+        return bool(
+            user and
+            user.is_authenticated and
+            user.is_active and
+            user.is_email_verified and
+            not user.is_blocked
         )
 
 
@@ -139,8 +184,10 @@ class IsOwnerOrReadOnly(BasePermission):
         Returns:
             bool: True si accès autorisé
         """
-        # Les méthodes sûres (GET, HEAD, OPTIONS) sont toujours autorisées
-        if request.method in ['GET', 'HEAD', 'OPTIONS']:
+        # Les méthodes sûres (GET, HEAD, OPTIONS) sont toujours autorisées.
+        # SAFE_METHODS est un tuple module-level: pas de liste reconstruite
+        # à chaque appel.
+        if request.method in SAFE_METHODS:
             return True
         # Sinon, vérifier que l'utilisateur est propriétaire
         return obj.id == request.user.id
@@ -156,7 +203,7 @@ class IsAdminOrOwner(BasePermission):
     
     def has_object_permission(self, request, view, obj):
         """Vérifie si l'utilisateur est admin ou propriétaire de l'objet."""
-        if request.user.role == 'admin':
+        if request.user.role == User.Role.ADMIN:
             return True
         return obj.id == request.user.id
 
@@ -230,31 +277,31 @@ class UserPermissions:
     def verified():
         """
         Email vérifié requis.
-        
+
         Returns:
-            list: [IsAuthenticated, IsActive, IsVerified]
+            list: [IsAuthenticatedActiveVerified]
         """
-        return [IsAuthenticated, IsActive, IsVerified]
+        return [IsAuthenticatedActiveVerified]
     
     @staticmethod
     def admin():
         """
-        Rôle admin requis.
-        
+        Rôle admin requis (l'authentification est vérifiée par IsAdmin).
+
         Returns:
-            list: [IsAuthenticated, IsAdmin]
+            list: [IsAdmin]
         """
-        return [IsAuthenticated, IsAdmin]
-    
+        return [IsAdmin]
+
     @staticmethod
     def staff():
         """
-        Rôle modérateur ou admin requis.
-        
+        Rôle modérateur ou admin requis (authentification incluse).
+
         Returns:
-            list: [IsAuthenticated, IsModerator]
+            list: [IsModerator]
         """
-        return [IsAuthenticated, IsModerator]
+        return [IsModerator]
     
     @staticmethod
     def owner_or_admin():
@@ -3,14 +3,66 @@ Sérialiseurs pour le module d'authentification.
 Sérialiseurs complets pour l'authentification et la gestion du profil utilisateur.
 """
 
+import re
+from functools import lru_cache
+
 from rest_framework import serializers
-from django.contrib.auth import get_user_model, authenticate
-from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.password_validation import (
+    get_default_password_validators, validate_password
+)
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
-# Récupérer le modèle utilisateur personnalisé
-User = get_user_model()
+from .models import EmailTokenRequest, User
+from .utils import check_email_token_user, verify_email_token
+
+# Validateurs de mot de passe instanciés une fois à l'import: chaque appel
+# de validate_password sans argument reconstruit la liste depuis
+# AUTH_PASSWORD_VALIDATORS (import + instanciation par validateur).
+_PASSWORD_VALIDATORS = get_default_password_validators()
+
+# Forme générale d'une adresse email, compilée une fois à l'import.
+# Suffisant pour les sérialiseurs de demande (connexion, réinitialisation,
+# vérification) où l'adresse ne sert qu'à retrouver un compte existant;
+# l'inscription conserve l'EmailValidator complet de Django.
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash():
+    """
+    Hachage factice pour les tentatives de connexion sur email inconnu.
+
+    Sans lui, un email absent de la base répond en quelques ms là où un
+    mauvais mot de passe sur un compte existant coûte une comparaison
+    bcrypt complète: l'écart de temps révèle l'existence du compte.
+    Construit paresseusement (une fois par processus) pour ne pas payer
+    le hachage au chargement du module.
+    """
+    return make_password('accounts.login.dummy')
+
+
+class FastEmailField(serializers.CharField):
+    """
+    Champ email allégé pour les chemins chauds.
+
+    Valide la forme avec une expression régulière pré-compilée au lieu
+    de la pile EmailValidator de DRF (validation en deux parties,
+    gestion IDN), superflue quand l'adresse est simplement comparée aux
+    emails stockés.
+    """
+
+    default_error_messages = {
+        'invalid': _('Saisissez une adresse email valide.')
+    }
+
+    def to_internal_value(self, data):
+        """Normalise et valide la forme de l'adresse."""
+        value = super().to_internal_value(data).strip()
+        if not _EMAIL_RE.match(value):
+            self.fail('invalid')
+        return value
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -66,7 +118,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         
         # Valider la force du mot de passe
         try:
-            validate_password(attrs['password'])
+            validate_password(attrs['password'], password_validators=_PASSWORD_VALIDATORS)
         except ValidationError as e:
             raise serializers.ValidationError({
                 'password': list(e.messages)
@@ -77,14 +129,22 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """
         Création de l'utilisateur.
-        Le mot de passe est haché automatiquement.
+        create_user() hache le mot de passe et insère en un seul passage
+        (au lieu d'instancier, ré-affecter le hachage, puis sauvegarder),
+        et applique les normalisations email/username du manager.
         """
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
-        user = User(**validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        return User.objects.create_user(password=password, **validated_data)
+
+    def to_representation(self, instance):
+        """
+        Représente l'utilisateur créé avec le sérialiseur de détail.
+
+        Les vues peuvent retourner serializer.data directement au lieu
+        d'instancier un second UserSerializer sur la même instance.
+        """
+        return UserSerializer(instance, context=self.context).data
 
 
 class UserLoginSerializer(serializers.Serializer):
@@ -93,8 +153,8 @@ class UserLoginSerializer(serializers.Serializer):
     Authentifie l'utilisateur avec email et mot de passe.
     """
     
-    # Champ email requis
-    email = serializers.EmailField(required=True)
+    # Champ email requis (validation regex pré-compilée)
+    email = FastEmailField(required=True)
     
     # Champ mot de passe (écriture seule)
     password = serializers.CharField(
@@ -107,41 +167,57 @@ class UserLoginSerializer(serializers.Serializer):
         """
         Validation des identifiants.
         Vérifie que l'utilisateur existe et est actif.
+
+        L'utilisateur est chargé en une seule requête indexée, et les
+        statuts actif/bloqué sont vérifiés AVANT check_password: la
+        comparaison de hachage (plusieurs centaines de ms par conception)
+        est ainsi économisée pour les comptes connus comme inutilisables.
         """
-        email = attrs.get('email')
+        # Normaliser en minuscules pour correspondre aux emails stockés
+        # (index fonctionnel sur lower(email))
+        email = attrs.get('email', '').lower()
         password = attrs.get('password')
-        
+
         # Vérifier que les deux champs sont remplis
         if not email or not password:
             raise serializers.ValidationError({
                 'detail': _('Les deux champs email et mot de passe sont requis.')
             })
-        
-        # Authentifier l'utilisateur
-        user = authenticate(
-            request=self.context.get('request'),
-            email=email,
-            password=password
-        )
-        
-        # Vérifier si l'authentification a réussi
+
+        # Une seule recherche indexée (authenticate() rechargeait
+        # l'utilisateur via le backend puis revérifiait les statuts)
+        user = User.objects.filter(email=email).first()
+
+        # Vérifier que l'utilisateur existe. La comparaison contre un
+        # hachage factice aligne le temps de réponse sur celui d'un
+        # mauvais mot de passe: l'existence du compte ne se lit plus
+        # dans la latence.
         if user is None:
+            check_password(password, _dummy_password_hash())
             raise serializers.ValidationError({
                 'detail': _('Email ou mot de passe invalide.')
             })
-        
-        # Vérifier si le compte est actif
+
+        # Vérifier si le compte est actif (avant le hachage coûteux)
         if not user.is_active:
             raise serializers.ValidationError({
                 'detail': _('Le compte utilisateur est désactivé.')
             })
-        
+
         # Vérifier si le compte n'est pas bloqué
         if user.is_blocked:
             raise serializers.ValidationError({
                 'detail': _('Le compte utilisateur est bloqué. Veuillez contacter le support.')
             })
-        
+
+        # Comparaison de hachage en dernier; check_password() sur
+        # l'instance conserve le re-hachage transparent si l'algorithme
+        # de hachage configuré a changé
+        if not user.check_password(password):
+            raise serializers.ValidationError({
+                'detail': _('Email ou mot de passe invalide.')
+            })
+
         attrs['user'] = user
         return attrs
 
@@ -186,9 +262,15 @@ class UserProfileSerializer(serializers.ModelSerializer):
         }
     
     def validate_username(self, value):
-        """Valide que le nom d'utilisateur est unique."""
+        """
+        Valide que le nom d'utilisateur est unique.
+
+        exists() émet un SELECT 1 ... LIMIT 1 servi par l'index unique sur
+        username: une seule recherche indexée par mise à jour. L'index
+        unique en base reste le garde-fou final en cas de concurrence.
+        """
         if value and User.objects.filter(username=value).exclude(
-            id=self.instance.id
+            pk=self.instance.pk
         ).exists():
             raise serializers.ValidationError(
                 _('Un utilisateur avec ce nom d\'utilisateur existe déjà.')
@@ -242,10 +324,18 @@ class PasswordChangeSerializer(serializers.Serializer):
             raise serializers.ValidationError({
                 'new_password_confirm': _("Les nouveaux mots de passe ne correspondent pas.")
             })
-        
+
+        # Rejeter un mot de passe inchangé avant tout hachage: l'ancien
+        # a déjà été vérifié (un calcul bcrypt), inutile d'en payer un
+        # second dans set_password pour réécrire la même valeur
+        if attrs['new_password'] == attrs['old_password']:
+            raise serializers.ValidationError({
+                'new_password': _("Le nouveau mot de passe doit être différent de l'ancien.")
+            })
+
         # Valider la force du nouveau mot de passe
         try:
-            validate_password(attrs['new_password'])
+            validate_password(attrs['new_password'], password_validators=_PASSWORD_VALIDATORS)
         except ValidationError as e:
             raise serializers.ValidationError({
                 'new_password': list(e.messages)
@@ -257,7 +347,9 @@ class PasswordChangeSerializer(serializers.Serializer):
         """Met à jour le mot de passe de l'utilisateur."""
         user = self.context['request'].user
         user.set_password(self.validated_data['new_password'])
-        user.save()
+        # Ne réécrire que la colonne modifiée: UPDATE plus compact et
+        # signaux pre/post_save informés que seul le mot de passe change
+        user.save(update_fields=['password'])
         return user
 
 
@@ -267,14 +359,11 @@ class PasswordResetRequestSerializer(serializers.Serializer):
     Envoie un email avec le lien de réinitialisation.
     """
     
-    email = serializers.EmailField(required=True)
-    
-    def validate_email(self, value):
-        """Valide que l'email existe (sans révéler l'existence)."""
-        if not User.objects.filter(email=value).exists():
-            # Ne pas révéler si l'utilisateur existe
-            return value
-        return value
+    # La validation se limite à la forme de l'adresse: l'existence du
+    # compte est résolue par la vue (réponse identique dans les deux cas
+    # pour ne pas révéler l'existence), une requête exists() ici serait
+    # un aller-retour base de données redondant.
+    email = FastEmailField(required=True)
 
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
@@ -300,22 +389,63 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
     )
     
     def validate(self, attrs):
-        """Valide que les nouveaux mots de passe correspondent."""
+        """
+        Valide le token de réinitialisation et les nouveaux mots de passe.
+
+        Le token est signé (HMAC horodaté): signature et expiration se
+        vérifient sans toucher la table des demandes, seule la recherche
+        de l'utilisateur par clé primaire reste. Le suffixe de mot de
+        passe porté par le token est comparé en temps constant — changer
+        le mot de passe invalide tous les tokens émis avant, ce qui rend
+        le token de réinitialisation à usage unique par construction.
+        """
         if attrs['new_password'] != attrs['new_password_confirm']:
             raise serializers.ValidationError({
                 'new_password_confirm': _("Les mots de passe ne correspondent pas.")
             })
-        
+
         # Valider la force du nouveau mot de passe
         try:
-            validate_password(attrs['new_password'])
+            validate_password(attrs['new_password'], password_validators=_PASSWORD_VALIDATORS)
         except ValidationError as e:
             raise serializers.ValidationError({
                 'new_password': list(e.messages)
             })
-        
+
+        # Vérification HMAC + expiration, sans requête
+        payload = verify_email_token(attrs['token'], 'reset')
+        if payload is None or payload[0] != attrs['user_id']:
+            raise serializers.ValidationError({
+                'token': _('Le token de réinitialisation est invalide.')
+            })
+
+        # Charger l'utilisateur (nécessaire pour set_password) et
+        # confirmer que le token correspond au mot de passe actuel
+        user = User.objects.filter(pk=payload[0]).first()
+        if user is None or not check_email_token_user(user, payload[1]):
+            raise serializers.ValidationError({
+                'token': _('Le token de réinitialisation est invalide.')
+            })
+
+        attrs['user'] = user
         return attrs
 
+    def save(self):
+        """
+        Définit le nouveau mot de passe et consomme les demandes de
+        réinitialisation de l'utilisateur.
+        """
+        user = self.validated_data['user']
+        user.set_password(self.validated_data['new_password'])
+        user.save(update_fields=['password'])
+        # Nettoyage des traces de demandes (l'usage unique est déjà
+        # garanti par le changement de hachage du mot de passe)
+        EmailTokenRequest.objects.filter(
+            email=user.email,
+            kind=EmailTokenRequest.Kind.RESET,
+        ).delete()
+        return user
+
 
 class EmailVerificationRequestSerializer(serializers.Serializer):
     """
@@ -323,7 +453,7 @@ class EmailVerificationRequestSerializer(serializers.Serializer):
     Envoie un email de vérification.
     """
     
-    email = serializers.EmailField(required=True)
+    email = FastEmailField(required=True)
 
 
 class TokenRefreshSerializer(serializers.Serializer):
@@ -367,3 +497,7 @@ class AdminUserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['role', 'is_active', 'is_blocked']
+
+    def to_representation(self, instance):
+        """Représente l'utilisateur mis à jour avec le sérialiseur de détail."""
+        return UserSerializer(instance, context=self.context).data
@@ -3,19 +3,19 @@ Signaux Django pour le module d'authentification.
 Gère les événements liés aux utilisateurs et les actions automatiques.
 """
 
+from django.core.cache import cache
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
-from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from .authentication import user_cache_key
+from .models import User
+
 import logging
 
 # Logger pour la journalisation
 logger = logging.getLogger(__name__)
 
-# Récupérer le modèle utilisateur personnalisé
-User = get_user_model()
-
 
 @receiver(pre_save, sender=User)
 def user_pre_save(sender, instance, **kwargs):
@@ -28,17 +28,24 @@ def user_pre_save(sender, instance, **kwargs):
         instance: L'instance de l'utilisateur
         **kwargs: Arguments supplémentaires
     """
-    # Vérifier si l'utilisateur existe déjà (modification)
-    if instance.pk:
-        try:
-            # Récupérer l'ancienne instance
-            old_instance = User.objects.get(pk=instance.pk)
-            # Stocker les valeurs originales pour comparaison
-            instance._original_role = old_instance.role
-            instance._original_is_active = old_instance.is_active
-            instance._original_is_blocked = old_instance.is_blocked
-        except User.DoesNotExist:
-            pass
+    # Sauvegarde ciblée (ex: update_fields=['password']) ne touchant ni
+    # le rôle ni les statuts: aucun diff à préparer
+    update_fields = kwargs.get('update_fields')
+    if update_fields and not ({'role', 'is_active', 'is_blocked'} & set(update_fields)):
+        return
+
+    # Les instances chargées depuis la base portent déjà leurs valeurs
+    # d'origine (capturées sans requête dans User.from_db). Ne requêter
+    # que pour les instances construites à la main (ex: User(pk=...)),
+    # et seulement les trois colonnes comparées.
+    if instance.pk and not hasattr(instance, '_original_role'):
+        row = User.objects.filter(pk=instance.pk).values_list(
+            'role', 'is_active', 'is_blocked'
+        ).first()
+        if row is not None:
+            (instance._original_role,
+             instance._original_is_active,
+             instance._original_is_blocked) = row
 
 
 @receiver(post_save, sender=User)
@@ -53,6 +60,12 @@ def user_post_save(sender, instance, created, **kwargs):
         created: True si l'utilisateur vient d'être créé
         **kwargs: Arguments supplémentaires
     """
+    # Invalider l'entrée de cache d'authentification: les changements de
+    # rôle/statut doivent être visibles dès la requête suivante (inutile
+    # pour une création, rien n'est encore en cache)
+    if not created:
+        cache.delete(user_cache_key(instance.pk))
+
     if created:
         # Nouvel utilisateur créé
         logger.info(f"Nouvel utilisateur créé: {instance.email} (Rôle: {instance.role})")
@@ -78,16 +91,6 @@ def user_post_save(sender, instance, created, **kwargs):
             status = "bloqué" if instance.is_blocked else "débloqué"
             logger.info(f"Utilisateur {status}: {instance.email}")
 
-
-@receiver(pre_save, sender=User)
-def update_last_login(sender, instance, **kwargs):
-    """
-    Signal émis avant la sauvegarde pour mettre à jour la dernière connexion.
-    Note: Ceci est géré par le paramètre UPDATE_LAST_LOGIN de SIMPLE_JWT.
-    
-    Args:
-        sender: Le modèle qui envoie le signal (User)
-        instance: L'instance de l'utilisateur
-        **kwargs: Arguments supplémentaires
-    """
-    pass
+# Note: la mise à jour de last_login est gérée par le paramètre
+# UPDATE_LAST_LOGIN de SIMPLE_JWT — pas de récepteur dédié ici, chaque
+# récepteur connecté coûte un appel à chaque sauvegarde.
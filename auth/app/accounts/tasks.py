@@ -0,0 +1,123 @@
+"""
+Tâches Celery pour le module d'authentification.
+Sort l'envoi d'emails du cycle requête/réponse: la vue répond dès que la
+tâche est en file, sans attendre l'aller-retour SMTP.
+"""
+
+from smtplib import SMTPException
+
+from celery import shared_task
+from django.conf import settings
+
+from .models import EmailTokenRequest, User
+from .utils import (
+    hash_token, make_email_token,
+    send_password_reset_email, send_verification_email, send_welcome_email
+)
+
+# Options communes: réessayer avec repli exponentiel sur erreur SMTP
+# transitoire, puis abandonner (les emails transactionnels peuvent être
+# redemandés par l'utilisateur)
+_EMAIL_TASK_OPTIONS = {
+    'bind': True,
+    'autoretry_for': (SMTPException,),
+    'retry_backoff': True,
+    'max_retries': 3,
+}
+
+
+@shared_task(**_EMAIL_TASK_OPTIONS)
+def send_welcome_email_task(self, user_id):
+    """
+    Envoie l'email de bienvenue en arrière-plan.
+
+    Args:
+        user_id: Identifiant du nouvel utilisateur
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    send_welcome_email(user)
+
+
+@shared_task(**_EMAIL_TASK_OPTIONS)
+def send_password_reset_email_task(self, user_id, token):
+    """
+    Envoie l'email de réinitialisation de mot de passe en arrière-plan.
+
+    Le worker recharge l'utilisateur par identifiant: ne sérialiser que
+    des types simples dans les arguments de tâche, jamais d'instances.
+
+    Args:
+        user_id: Identifiant de l'utilisateur destinataire
+        token: Token de réinitialisation en clair (jamais persisté)
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    reset_url = f'{settings.FRONTEND_URL}/reset-password?token={token}&user_id={user_id}'
+    send_password_reset_email(user, reset_url)
+
+
+@shared_task(**_EMAIL_TASK_OPTIONS)
+def send_verification_email_task(self, user_id, token):
+    """
+    Envoie l'email de vérification d'adresse en arrière-plan.
+
+    Args:
+        user_id: Identifiant de l'utilisateur destinataire
+        token: Token de vérification en clair (jamais persisté)
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    verify_url = f'{settings.FRONTEND_URL}/verify-email?token={token}&user_id={user_id}'
+    send_verification_email(user, verify_url)
+
+
+@shared_task
+def process_password_reset_request(email):
+    """
+    Traite une demande de réinitialisation entièrement hors requête.
+
+    La vue répond un 200 générique avant même la recherche du compte:
+    le temps de réponse ne dépend plus ni de la charge base de données
+    ni de l'existence de l'email (canal auxiliaire d'énumération fermé).
+
+    Args:
+        email: Adresse email soumise par le client
+    """
+    user = User.objects.filter(email=email.lower()).first()
+    if user is None:
+        return
+    # Token signé: la confirmation vérifie un HMAC, pas une ligne en base
+    token = make_email_token(user, 'reset')
+    # Trace de la demande (audit / nettoyage TTL), pas la source de vérité
+    EmailTokenRequest.objects.create(
+        email=user.email,
+        kind=EmailTokenRequest.Kind.RESET,
+        token_hash=hash_token(token),
+    )
+    reset_url = f'{settings.FRONTEND_URL}/reset-password?token={token}&user_id={user.pk}'
+    send_password_reset_email(user, reset_url)
+
+
+@shared_task
+def process_email_verification_request(email):
+    """
+    Traite une demande de vérification d'email hors requête.
+
+    Args:
+        email: Adresse email soumise par le client
+    """
+    user = User.objects.filter(email=email.lower()).first()
+    if user is None or user.is_email_verified:
+        return
+    token = make_email_token(user, 'verify')
+    EmailTokenRequest.objects.create(
+        email=user.email,
+        kind=EmailTokenRequest.Kind.VERIFY,
+        token_hash=hash_token(token),
+    )
+    verify_url = f'{settings.FRONTEND_URL}/verify-email?token={token}&user_id={user.pk}'
+    send_verification_email(user, verify_url)
@@ -0,0 +1,72 @@
+"""
+Classes de limitation de débit personnalisées pour le module d'authentification.
+Compteurs atomiques en fenêtre fixe au lieu des historiques de DRF.
+"""
+
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+
+class AtomicThrottleMixin:
+    """
+    Limitation en fenêtre fixe par compteur atomique dans le cache.
+
+    SimpleRateThrottle conserve par clé une liste d'horodatages
+    sérialisée (pickle): chaque requête fait un get, reconstruit la
+    liste filtrée puis la réécrit — deux allers-retours non atomiques
+    et une mémoire proportionnelle au taux autorisé. Ici, une requête
+    coûte un incr atomique (INCR natif sur le backend Redis) sur un
+    entier dont le TTL expire avec la fenêtre: mémoire constante par
+    clé et pas de fenêtre de course entre lecture et écriture.
+    """
+
+    def allow_request(self, request, view):
+        """
+        Vérifie si la requête est autorisée pour cette fenêtre.
+
+        Args:
+            request: La requête entrante
+            view: La vue ciblée
+
+        Returns:
+            bool: True si la requête est autorisée
+        """
+        if self.rate is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        # add() ne pose le compteur (et son TTL) que si la clé est
+        # absente: c'est le début d'une nouvelle fenêtre
+        if self.cache.add(key, 1, self.duration):
+            return True
+
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # La clé a expiré entre add() et incr(): nouvelle fenêtre
+            self.cache.add(key, 1, self.duration)
+            return True
+
+        return count <= self.num_requests
+
+    def wait(self):
+        """
+        Délai suggéré avant une nouvelle tentative.
+
+        Le compteur ne mémorise pas le début de la fenêtre; la durée
+        complète de la fenêtre sert de borne supérieure prudente.
+
+        Returns:
+            int: Nombre de secondes à attendre
+        """
+        return self.duration
+
+
+class AtomicAnonRateThrottle(AtomicThrottleMixin, AnonRateThrottle):
+    """Limitation atomique pour les requêtes anonymes (clé par IP)."""
+
+
+class AtomicUserRateThrottle(AtomicThrottleMixin, UserRateThrottle):
+    """Limitation atomique pour les requêtes authentifiées (clé par utilisateur)."""
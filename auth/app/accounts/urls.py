@@ -4,7 +4,7 @@ Points de terminaison API pour l'authentification et la gestion des utilisateurs
 """
 
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
@@ -15,8 +15,11 @@ from .views import (
     AdminUserUpdateView, UserViewSet
 )
 
-# Créer un routeur pour le ViewSet
-router = DefaultRouter()
+# Créer un routeur pour le ViewSet. SimpleRouter: les points de
+# terminaison sont déjà tous listés explicitement ci-dessous, la vue
+# racine et les suffixes de format de DefaultRouter n'ajoutaient que des
+# motifs d'URL à parcourir à chaque résolution.
+router = SimpleRouter()
 # Enregistrer le ViewSet des utilisateurs avec le routeur
 router.register(r'users', UserViewSet, basename='user')
 
@@ -71,9 +74,8 @@ urlpatterns = [
     path('admin/users/<int:user_id>/update/', AdminUserUpdateView.as_view(), name='admin-user-update'),
     
     # ==================== URLs du ViewSet ====================
-    # Inclure les URLs générées par le routeur
+    # Inclure les URLs générées par le routeur (une seule fois: le
+    # résolveur d'URL parcourt la liste linéairement, chaque doublon
+    # rallonge le parcours de toutes les requêtes sans correspondance)
     path('', include(router.urls)),
 ]
-
-# Ajouter les URLs du routeur à la liste principale
-urlpatterns += router.urls
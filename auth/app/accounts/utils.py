@@ -3,15 +3,23 @@ Fonctions utilitaires pour le module d'authentification.
 Fonctions d'aide pour les tâches courantes d'authentification.
 """
 
+import hashlib
+import math
 import secrets
 import string
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+import time
+from functools import lru_cache
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
 from django.conf import settings
+from django.core.cache import cache
+from django.core.signing import BadSignature, SignatureExpired, TimestampSigner
+from django.utils.crypto import constant_time_compare
 from django.utils.translation import gettext_lazy as _
-from django.utils import timezone
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken, OutstandingToken
+)
 
 import logging
 
@@ -19,46 +27,187 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Alphabets des mots de passe générés, construits une fois à l'import
+# (l'ancienne version reconcaténait l'alphabet à chaque appel)
+_PW_LOWER = string.ascii_lowercase
+_PW_UPPER = string.ascii_uppercase
+_PW_DIGITS = string.digits
+_PW_ALPHABET = string.ascii_letters + string.digits + "!@#$%^&*"
+
+# Générateur aléatoire cryptographique partagé (pour shuffle)
+_SYSTEM_RANDOM = secrets.SystemRandom()
+
+
 def generate_random_password(length=12):
     """
     Génère un mot de passe aléatoire sécurisé.
-    
+
+    Construction en un seul passage: un caractère tiré de chaque classe
+    requise (minuscule, majuscule, chiffre), le reste dans l'alphabet
+    complet, puis mélange. Remplace la boucle tirage/rejet qui
+    regénérait tout le mot de passe tant qu'une classe manquait.
+
     Args:
         length: Longueur du mot de passe (défaut: 12)
-    
+
     Returns:
         str: Mot de passe aléatoire
     """
-    # Caractères autorisés: lettres majuscules, minuscules, chiffres, symboles
-    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-    while True:
-        # Générer un mot de passe aléatoire
-        password = ''.join(secrets.choice(alphabet) for _ in range(length))
-        # Vérifier qu'il contient au moins une minuscule, une majuscule et un chiffre
-        if (any(c.islower() for c in password) and
-            any(c.isupper() for c in password) and
-            any(c.isdigit() for c in password)):
-            return password
-
-
-def generate_verification_token():
+    chars = [
+        secrets.choice(_PW_LOWER),
+        secrets.choice(_PW_UPPER),
+        secrets.choice(_PW_DIGITS),
+    ]
+    chars += [secrets.choice(_PW_ALPHABET) for _ in range(length - 3)]
+    # Mélanger pour ne pas fixer la position des classes imposées
+    _SYSTEM_RANDOM.shuffle(chars)
+    return ''.join(chars)
+
+
+# Durée de vie des tokens envoyés par email (24h, cf. templates)
+EMAIL_TOKEN_MAX_AGE = 60 * 60 * 24
+
+
+def _token_signer(purpose):
+    """Signataire horodaté dédié à un usage de token ('reset', 'verify')."""
+    return TimestampSigner(salt=f'accounts.token.{purpose}')
+
+
+def make_email_token(user, purpose):
     """
-    Génère un jeton de vérification d'email sécurisé.
-    
+    Émet un token signé (HMAC + horodatage) pour un utilisateur.
+
+    Le token porte l'identifiant et la fin du hachage de mot de passe:
+    la validation est une vérification HMAC sans lecture de la table de
+    tokens, et tout changement de mot de passe invalide d'office les
+    tokens en circulation (usage unique automatique pour le reset).
+
+    Args:
+        user: Instance de l'utilisateur
+        purpose: Usage du token ('reset' ou 'verify')
+
     Returns:
-        str: Jeton URL-safe aléatoire
+        str: Token signé
     """
-    return secrets.token_urlsafe(32)
+    return _token_signer(purpose).sign(f'{user.pk}:{user.password[-8:]}')
 
 
-def generate_password_reset_token():
+def verify_email_token(token, purpose, max_age=EMAIL_TOKEN_MAX_AGE):
     """
-    Génère un jeton de réinitialisation de mot de passe sécurisé.
-    
+    Vérifie un token signé et retourne l'identifiant utilisateur porté.
+
+    La signature et l'expiration sont contrôlées sans requête; il reste
+    à l'appelant de charger l'utilisateur et de confirmer le suffixe de
+    mot de passe via check_email_token_user.
+
+    Args:
+        token: Token signé reçu du client
+        purpose: Usage attendu ('reset' ou 'verify')
+        max_age: Age maximal accepté en secondes
+
     Returns:
-        str: Jeton URL-safe aléatoire
+        tuple: (user_id: int, password_tail: str), ou None si invalide
     """
-    return secrets.token_urlsafe(32)
+    try:
+        value = _token_signer(purpose).unsign(token, max_age=max_age)
+        user_id, password_tail = value.split(':', 1)
+        return int(user_id), password_tail
+    except (BadSignature, SignatureExpired, ValueError):
+        return None
+
+
+def check_email_token_user(user, password_tail):
+    """
+    Confirme qu'un token correspond toujours au mot de passe actuel.
+
+    Args:
+        user: Instance de l'utilisateur chargée par l'appelant
+        password_tail: Suffixe porté par le token
+
+    Returns:
+        bool: True si le token est encore valable pour cet utilisateur
+    """
+    return constant_time_compare(password_tail, user.password[-8:])
+
+
+def hash_token(token):
+    """
+    Calcule l'empreinte SHA-256 d'un token (pour stockage et recherche).
+
+    Seule l'empreinte est stockée en base: la recherche compare 32 octets
+    de largeur fixe, et le token en clair n'est jamais persisté.
+
+    Args:
+        token: Token en clair (str)
+
+    Returns:
+        bytes: Empreinte SHA-256 (32 octets)
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
+@lru_cache(maxsize=16)
+def _get_email_template(name):
+    """
+    Retourne le template compilé (mémoïsé par processus).
+
+    Combiné au chargeur avec cache des settings, le rendu d'un email ne
+    paie plus ni stat disque ni recompilation du template.
+    """
+    return get_template(name)
+
+
+def build_templated_email(subject, template, context, recipient):
+    """
+    Construit un message email HTML + texte brut depuis un template.
+
+    Le message n'est pas envoyé: les appelants peuvent en accumuler
+    plusieurs et les remettre ensemble à send_email_batch pour
+    n'ouvrir qu'une seule session SMTP.
+
+    Args:
+        subject: Sujet de l'email
+        template: Chemin du template HTML
+        context: Contexte de rendu du template
+        recipient: Adresse email destinataire
+
+    Returns:
+        EmailMultiAlternatives: Message prêt à l'envoi
+    """
+    html_message = _get_email_template(template).render(context)
+    # Version texte rendue depuis le template .txt jumeau: évite le
+    # balayage regex de strip_tags sur tout le corps HTML à chaque envoi
+    plain_message = _get_email_template(
+        template.replace('.html', '.txt')
+    ).render(context)
+    message = EmailMultiAlternatives(
+        subject,
+        plain_message,
+        settings.DEFAULT_FROM_EMAIL,
+        [recipient],
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
+
+def send_email_batch(messages):
+    """
+    Envoie un lot de messages sur une seule connexion SMTP.
+
+    Chaque send_mail isolé paie la poignée de main TCP+TLS+AUTH
+    (~3 allers-retours); une connexion partagée ne la paie qu'une fois
+    par lot.
+
+    Args:
+        messages: Messages EmailMultiAlternatives à envoyer
+
+    Returns:
+        int: Nombre de messages envoyés
+    """
+    if not messages:
+        return 0
+    with get_connection() as connection:
+        return connection.send_messages(messages) or 0
 
 
 def send_welcome_email(user):
@@ -69,25 +218,13 @@ def send_welcome_email(user):
         user: Instance de l'utilisateur
     """
     try:
-        subject = _('Bienvenue sur notre plateforme !')
-        context = {
-            'user': user,
-            'login_url': settings.FRONTEND_URL + '/login'
-        }
-        # Rendre le template HTML
-        html_message = render_to_string('accounts/email/welcome.html', context)
-        # Version texte brut du message
-        plain_message = strip_tags(html_message)
-        
-        # Envoyer l'email
-        send_mail(
-            subject,
-            plain_message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            html_message=html_message,
-            fail_silently=True
+        message = build_templated_email(
+            _('Bienvenue sur notre plateforme !'),
+            'accounts/email/welcome.html',
+            {'user': user, 'login_url': settings.FRONTEND_URL + '/login'},
+            user.email,
         )
+        send_email_batch([message])
         logger.info(f"Email de bienvenue envoyé à {user.email}")
     except Exception as e:
         logger.error(f"Échec de l'envoi de l'email de bienvenue à {user.email}: {e}")
@@ -102,22 +239,13 @@ def send_password_reset_email(user, reset_url):
         reset_url: URL de réinitialisation du mot de passe
     """
     try:
-        subject = _('Demande de réinitialisation de mot de passe')
-        context = {
-            'user': user,
-            'reset_url': reset_url
-        }
-        html_message = render_to_string('accounts/email/password_reset.html', context)
-        plain_message = strip_tags(html_message)
-        
-        send_mail(
-            subject,
-            plain_message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            html_message=html_message,
-            fail_silently=True
+        message = build_templated_email(
+            _('Demande de réinitialisation de mot de passe'),
+            'accounts/email/password_reset.html',
+            {'user': user, 'reset_url': reset_url},
+            user.email,
         )
+        send_email_batch([message])
         logger.info(f"Email de réinitialisation envoyé à {user.email}")
     except Exception as e:
         logger.error(f"Échec de l'envoi de l'email de réinitialisation à {user.email}: {e}")
@@ -132,22 +260,13 @@ def send_verification_email(user, verify_url):
         verify_url: URL de vérification de l'email
     """
     try:
-        subject = _('Vérifiez votre adresse email')
-        context = {
-            'user': user,
-            'verify_url': verify_url
-        }
-        html_message = render_to_string('accounts/email/email_verification.html', context)
-        plain_message = strip_tags(html_message)
-        
-        send_mail(
-            subject,
-            plain_message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            html_message=html_message,
-            fail_silently=True
+        message = build_templated_email(
+            _('Vérifiez votre adresse email'),
+            'accounts/email/email_verification.html',
+            {'user': user, 'verify_url': verify_url},
+            user.email,
         )
+        send_email_batch([message])
         logger.info(f"Email de vérification envoyé à {user.email}")
     except Exception as e:
         logger.error(f"Échec de l'envoi de l'email de vérification à {user.email}: {e}")
@@ -156,20 +275,31 @@ def send_verification_email(user, verify_url):
 def invalidate_user_tokens(user):
     """
     Invalide tous les tokens d'un utilisateur (déconnexion universelle).
-    
+
+    Insertion en masse dans la liste noire: un seul INSERT pour tous les
+    tokens en circulation au lieu d'un SELECT + INSERT par token
+    (token.blacklist() fait un get_or_create chacun), le coût de la
+    déconnexion globale devient indépendant du nombre de tokens actifs.
+
     Args:
         user: Instance de l'utilisateur
-    
+
     Returns:
         int: Nombre de tokens mis en liste noire
     """
     try:
-        # Récupérer tous les refresh tokens de l'utilisateur
-        refresh_tokens = RefreshToken.objects.filter(user=user)
-        count = refresh_tokens.count()
-        # Mettre chaque token en liste noire
-        for token in refresh_tokens:
-            token.blacklist()
+        # Tokens en circulation pas encore en liste noire
+        outstanding = OutstandingToken.objects.filter(user=user).exclude(
+            id__in=BlacklistedToken.objects.filter(
+                token__user=user
+            ).values('token_id')
+        )
+        created = BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id)
+             for token_id in outstanding.values_list('id', flat=True)],
+            ignore_conflicts=True,
+        )
+        count = len(created)
         logger.info(f"Invalidation de {count} tokens pour l'utilisateur {user.email}")
         return count
     except Exception as e:
@@ -180,104 +310,152 @@ def invalidate_user_tokens(user):
 def get_client_ip(request):
     """
     Récupère l'adresse IP du client à partir de la requête.
-    
+
+    Le résultat est mémoïsé sur la requête: limiteur de débit et journal
+    d'audit l'appellent tous deux sur le même objet.
+
     Args:
         request: Objet de requête HTTP
-    
+
     Returns:
         str: Adresse IP du client
     """
-    # Vérifier si la requête passe par un proxy
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        # Prendre la première IP (celle du client)
-        return x_forwarded_for.split(',')[0].strip()
-    return request.META.get('REMOTE_ADDR', '')
+    ip = getattr(request, '_client_ip', None)
+    if ip is None:
+        # Derrière un proxy, la première IP de la chaîne est celle du
+        # client; partition() n'alloue que ce premier segment là où
+        # split(',') matérialisait toute la chaîne en liste
+        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if x_forwarded_for:
+            ip = x_forwarded_for.partition(',')[0].strip()
+        else:
+            ip = request.META.get('REMOTE_ADDR', '')
+        request._client_ip = ip
+    return ip
 
 
 def log_user_action(user, action, request, details=''):
     """
     Journalise une action utilisateur pour l'audit.
-    
+
+    Le niveau est testé avant toute construction: quand INFO est coupé,
+    l'appel se réduit à ce test au lieu de payer l'accès à META (IP) et
+    le formatage. Le message est formaté paresseusement par le logger et
+    les valeurs passent aussi en extra= pour les backends structurés.
+
     Args:
         user: Instance de l'utilisateur
         action: Action effectuée
         request: Objet de requête HTTP
         details: Détails supplémentaires
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    ip = get_client_ip(request)
     logger.info(
-        f"Action utilisateur: {user.email} | Action: {action} | "
-        f"IP: {get_client_ip(request)} | Détails: {details}"
+        "Action utilisateur: %s | Action: %s | IP: %s | Détails: %s",
+        user.email, action, ip, details,
+        extra={
+            'user': user.email,
+            'action': action,
+            'ip': ip,
+            'details': details,
+        },
     )
 
 
 class RateLimiter:
     """
-    Limiteur de débit simple pour prévenir les attaques par force brute.
+    Limiteur de débit en seau à jetons, partagé via le cache.
+
+    L'ancienne version conservait une liste d'horodatages par clé dans
+    la mémoire du processus: état fragmenté entre les workers (chacun
+    appliquait sa propre limite) et filtrage O(max_requests) à chaque
+    vérification. Le seau à jetons ne stocke que deux nombres par clé
+    (jetons restants, dernier remplissage) dans le cache — Redis en
+    production, donc limite appliquée globalement — et chaque
+    vérification est en O(1).
     """
-    
-    def __init__(self, max_requests=5, time_window=60):
+
+    def __init__(self, max_requests=5, time_window=60, prefix='accounts:ratelimit'):
         """
         Initialise le limiteur de débit.
-        
+
         Args:
             max_requests: Nombre maximal de requêtes autorisées
             time_window: Fenêtre de temps en secondes
+            prefix: Préfixe des clés de cache
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = {}
-    
+        # Débit de remplissage: la capacité complète se régénère sur
+        # une fenêtre
+        self.refill_rate = max_requests / time_window
+        self.prefix = prefix
+
+    def _cache_key(self, key):
+        """Clé de cache du seau pour un identifiant."""
+        return f'{self.prefix}:{key}'
+
+    def _current_tokens(self, key, now):
+        """
+        Calcule le niveau actuel du seau (remplissage au prorata du
+        temps écoulé depuis la dernière écriture).
+        """
+        state = cache.get(self._cache_key(key))
+        if state is None:
+            return float(self.max_requests)
+        tokens, last_refill = state
+        return min(
+            float(self.max_requests),
+            tokens + (now - last_refill) * self.refill_rate,
+        )
+
     def is_rate_limited(self, key):
         """
-        Vérifie si la clé est limitée en débit.
-        
+        Vérifie si la clé est limitée en débit (et consomme un jeton).
+
+        Le délai retourné permet à la vue d'émettre un 429 avec
+        ``Retry-After`` et ``Cache-Control: public, max-age=<délai>``:
+        un CDN ou nginx en amont peut alors mettre la réponse en cache
+        jusqu'au prochain jeton et absorber la rafale sans que chaque
+        requête bloquée ne retraverse Django et le cache.
+
         Args:
             key: Identifiant unique (ex: IP, ID utilisateur)
-        
+
         Returns:
-            bool: True si limité, False sinon
+            tuple: (limité, secondes avant le prochain jeton — 0 si
+            la requête est autorisée)
         """
-        now = timezone.now()
-        window_start = now - timezone.timedelta(seconds=self.time_window)
-        
-        # Initialiser la liste des requêtes pour cette clé
-        if key not in self.requests:
-            self.requests[key] = []
-        
-        # Supprimer les requêtes anciennes hors de la fenêtre
-        self.requests[key] = [
-            req_time for req_time in self.requests[key]
-            if req_time > window_start
-        ]
-        
-        # Vérifier si la limite est dépassée
-        if len(self.requests[key]) >= self.max_requests:
-            return True
-        
-        # Ajouter la requête actuelle
-        self.requests[key].append(now)
-        return False
-    
+        now = time.time()
+        tokens = self._current_tokens(key, now)
+
+        if tokens < 1:
+            # Temps nécessaire pour régénérer le jeton manquant,
+            # arrondi à la seconde supérieure (Retry-After est entier)
+            retry_after = math.ceil((1 - tokens) / self.refill_rate)
+            return True, retry_after
+
+        # Consommer un jeton. L'écriture n'est pas atomique: deux
+        # requêtes simultanées peuvent consommer le même jeton, marge
+        # acceptable pour une protection anti-force-brute.
+        cache.set(
+            self._cache_key(key),
+            (tokens - 1, now),
+            self.time_window * 2,
+        )
+        return False, 0
+
     def get_remaining_requests(self, key):
         """
-        Récupère le nombre de requêtes restantes pour la clé.
-        
+        Récupère le nombre de requêtes restantes pour la clé (sans
+        consommer de jeton).
+
         Args:
             key: Identifiant unique
-        
+
         Returns:
             int: Nombre de requêtes restantes
         """
-        now = timezone.now()
-        window_start = now - timezone.timedelta(seconds=self.time_window)
-        
-        if key not in self.requests:
-            return self.max_requests
-        
-        recent_requests = [
-            req_time for req_time in self.requests[key]
-            if req_time > window_start
-        ]
-        
-        return max(0, self.max_requests - len(recent_requests))
+        return int(self._current_tokens(key, time.time()))
@@ -3,14 +3,16 @@ Vues API pour le module d'authentification.
 Ensemble complet de vues pour l'authentification et la gestion des utilisateurs.
 """
 
-import secrets
+import time
+
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.conf import settings
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.views import View
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status, viewsets
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -18,7 +20,10 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .models import User
-
+from .tasks import (
+    process_email_verification_request, process_password_reset_request,
+    send_welcome_email_task
+)
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserSerializer,
     UserProfileSerializer, PasswordChangeSerializer, PasswordResetRequestSerializer,
@@ -32,25 +37,66 @@ from .permissions import (
 )
 
 
-class HealthCheckView(APIView):
+# Colonnes de la liste des utilisateurs, figées en tuple à l'import:
+# évite de retraverser UserListSerializer.Meta à chaque requête de liste
+_USER_LIST_FIELDS = tuple(UserListSerializer.Meta.fields)
+
+
+def _user_payload(user):
+    """
+    Retourne la représentation UserSerializer d'un utilisateur, mise en
+    cache.
+
+    Le payload est stable entre deux modifications du compte: la clé de
+    cache incorpore updated_at et last_login, donc toute mise à jour du
+    profil (auto_now) ou nouvelle connexion fait rouler la clé sans
+    invalidation explicite, et l'ancienne entrée expire par TTL. Sur
+    succès de cache, /profile/ ne paie plus la sérialisation.
+
+    Args:
+        user: Instance User à sérialiser
+
+    Returns:
+        dict: Données sérialisées de l'utilisateur
+    """
+    stamp = user.updated_at.timestamp()
+    if user.last_login is not None:
+        stamp = max(stamp, user.last_login.timestamp())
+    key = f'accounts:user_payload:{user.pk}:{stamp}'
+    data = cache.get(key)
+    if data is None:
+        # L'authentification allégée diffère les colonnes larges (bio,
+        # address, avatar) que UserSerializer sérialise: les recharger
+        # en une seule requête plutôt qu'un SELECT par colonne différée
+        if user.get_deferred_fields():
+            user = User.objects.defer('search_vector').get(pk=user.pk)
+        data = UserSerializer(user).data
+        cache.set(key, data, 3600)
+    return data
+
+
+class HealthCheckView(View):
     """
     Point de terminaison de vérification de l'état de santé.
     Aucune authentification requise.
+
+    Vue Django simple (hors DRF): les load balancers interrogent ce point
+    plusieurs fois par seconde et n'ont besoin ni de la négociation de
+    contenu ni du rendu DRF. Le timestamp flottant évite la construction
+    d'un datetime à chaque appel.
     """
-    
-    permission_classes = []
-    
+
     def get(self, request):
         """
         Retourne l'état de santé du service.
-        
+
         Returns:
-            Response: JSON avec le statut du service
+            JsonResponse: JSON avec le statut du service
         """
-        return Response({
+        return JsonResponse({
             'status': 'healthy',
             'service': 'authentication',
-            'timestamp': timezone.now().isoformat()
+            'timestamp': time.time(),
         })
 
 
@@ -83,8 +129,13 @@ class RegisterView(APIView):
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
+            # Email de bienvenue envoyé par un worker Celery: la réponse
+            # d'inscription ne dépend pas de l'aller-retour SMTP
+            send_welcome_email_task.delay(user.pk)
+            # serializer.data délègue à UserSerializer via
+            # to_representation: pas de second sérialiseur à construire
             return Response(
-                UserSerializer(user).data,
+                serializer.data,
                 status=status.HTTP_201_CREATED
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -136,12 +187,15 @@ class LoginView(APIView):
             # Générer les tokens
             refresh = RefreshToken.for_user(user)
             
-            # Mettre à jour la dernière connexion
+            # Mettre à jour la dernière connexion par un UPDATE direct:
+            # pas de pipeline save() ni de dispatch de signaux pour une
+            # colonne d'horodatage (après la génération des tokens, pour
+            # qu'une erreur base n'empêche pas l'authentification)
             user.last_login = timezone.now()
-            user.save(update_fields=['last_login'])
+            User.objects.filter(pk=user.pk).update(last_login=user.last_login)
             
             return Response({
-                'user': UserSerializer(user).data,
+                'user': _user_payload(user),
                 'access': str(refresh.access_token),
                 'refresh': str(refresh),
             })
@@ -219,8 +273,7 @@ class ProfileView(APIView):
         Returns:
             Response: Données du profil utilisateur
         """
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        return Response(_user_payload(request.user))
 
 
 class ProfileUpdateView(APIView):
@@ -255,8 +308,9 @@ class ProfileUpdateView(APIView):
             partial=True
         )
         if serializer.is_valid():
-            user = serializer.save()
-            return Response(UserProfileSerializer(user).data)
+            serializer.save()
+            # Réutiliser la représentation du sérialiseur déjà lié
+            return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -326,21 +380,17 @@ class PasswordResetRequestView(APIView):
         """
         serializer = PasswordResetRequestSerializer(data=request.data)
         if serializer.is_valid():
-            email = serializer.validated_data['email']
-            try:
-                user = User.objects.get(email=email)
-                # Générer le token de réinitialisation
-                token = secrets.token_urlsafe(32)
-                # Stocker le token et envoyer l'email
-                return Response(
-                    {'detail': _('L\'email de réinitialisation a été envoyé.')},
-                    status=status.HTTP_200_OK
-                )
-            except User.DoesNotExist:
-                return Response(
-                    {'detail': _('L\'email de réinitialisation a été envoyé.')},
-                    status=status.HTTP_200_OK
-                )
+            # Recherche du compte, création du token et envoi délégués à
+            # un worker Celery: la réponse (identique que le compte
+            # existe ou non) ne dépend ni de la base ni du SMTP, et son
+            # temps ne révèle pas l'existence de l'email
+            process_password_reset_request.delay(
+                serializer.validated_data['email']
+            )
+            return Response(
+                {'detail': _('L\'email de réinitialisation a été envoyé.')},
+                status=status.HTTP_200_OK
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -372,6 +422,7 @@ class PasswordResetConfirmView(APIView):
         """
         serializer = PasswordResetConfirmSerializer(data=request.data)
         if serializer.is_valid():
+            serializer.save()
             return Response(
                 {'detail': _('Le mot de passe a été réinitialisé avec succès.')},
                 status=status.HTTP_200_OK
@@ -406,25 +457,15 @@ class EmailVerificationRequestView(APIView):
         """
         serializer = EmailVerificationRequestSerializer(data=request.data)
         if serializer.is_valid():
-            email = serializer.validated_data['email']
-            try:
-                user = User.objects.get(email=email)
-                if user.is_email_verified:
-                    return Response(
-                        {'detail': _('L\'email est déjà vérifié.')},
-                        status=status.HTTP_200_OK
-                    )
-                # Générer le token de vérification
-                token = secrets.token_urlsafe(32)
-                return Response(
-                    {'detail': _('L\'email de vérification a été envoyé.')},
-                    status=status.HTTP_200_OK
-                )
-            except User.DoesNotExist:
-                return Response(
-                    {'detail': _('L\'email de vérification a été envoyé.')},
-                    status=status.HTTP_200_OK
-                )
+            # Même réponse générique dans tous les cas (compte absent ou
+            # déjà vérifié inclus), tout le travail part en tâche Celery
+            process_email_verification_request.delay(
+                serializer.validated_data['email']
+            )
+            return Response(
+                {'detail': _('L\'email de vérification a été envoyé.')},
+                status=status.HTTP_200_OK
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -435,7 +476,9 @@ class UserListView(APIView):
     Authentification et rôle admin requis.
     """
     
-    permission_classes = [IsAuthenticated, IsAdmin]
+    # IsAdmin vérifie déjà l'authentification: une seule classe
+    # de permission à instancier et exécuter par requête
+    permission_classes = [IsAdmin]
     
     @swagger_auto_schema(
         responses={
@@ -453,9 +496,17 @@ class UserListView(APIView):
         Returns:
             Response: Liste des utilisateurs
         """
-        users = User.objects.all()
-        serializer = UserListSerializer(users, many=True)
-        return Response(serializer.data)
+        # Sortie construite directement depuis values(): pour une liste en
+        # lecture seule, la machinerie par champ de ModelSerializer
+        # (bind/get_attribute/to_representation) domine le CPU; values()
+        # produit les mêmes dictionnaires sans instancier de modèles.
+        rows = User.objects.values(*_USER_LIST_FIELDS)
+        # Paginer: borne la taille de la réponse et transforme la
+        # requête en LIMIT/OFFSET au lieu de charger toute la table.
+        # La taille de page vient du réglage PAGE_SIZE du projet.
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(rows, request)
+        return paginator.get_paginated_response(page)
 
 
 class UserDetailView(APIView):
@@ -465,7 +516,9 @@ class UserDetailView(APIView):
     Authentification requise.
     """
     
-    permission_classes = [IsAuthenticated, IsAdmin]
+    # IsAdmin vérifie déjà l'authentification: une seule classe
+    # de permission à instancier et exécuter par requête
+    permission_classes = [IsAdmin]
     
     def get(self, request, user_id):
         """
@@ -478,15 +531,14 @@ class UserDetailView(APIView):
         Returns:
             Response: Données de l'utilisateur ou erreur 404
         """
-        try:
-            user = User.objects.get(id=user_id)
-            serializer = UserSerializer(user)
-            return Response(serializer.data)
-        except User.DoesNotExist:
-            return Response(
-                {'detail': _('Utilisateur non trouvé.')},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        # get_object_or_404 évite le contrôle de flux par exception dans
+        # la vue; le vecteur de recherche (jamais sérialisé) est différé.
+        # Pas de select_related: User ne porte aucune clé étrangère.
+        user = get_object_or_404(
+            User.objects.defer('search_vector'), pk=user_id
+        )
+        serializer = UserSerializer(user)
+        return Response(serializer.data)
 
 
 class AdminUserUpdateView(APIView):
@@ -496,7 +548,9 @@ class AdminUserUpdateView(APIView):
     Authentification et rôle admin requis.
     """
     
-    permission_classes = [IsAuthenticated, IsAdmin]
+    # IsAdmin vérifie déjà l'authentification: une seule classe
+    # de permission à instancier et exécuter par requête
+    permission_classes = [IsAdmin]
     
     @swagger_auto_schema(
         request_body=AdminUserUpdateSerializer,
@@ -516,22 +570,20 @@ class AdminUserUpdateView(APIView):
         Returns:
             Response: Utilisateur mis à jour ou erreur
         """
-        try:
-            user = User.objects.get(id=user_id)
-            serializer = AdminUserUpdateSerializer(
-                user,
-                data=request.data,
-                partial=True
-            )
-            if serializer.is_valid():
-                user = serializer.save()
-                return Response(UserSerializer(user).data)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        except User.DoesNotExist:
-            return Response(
-                {'detail': _('Utilisateur non trouvé.')},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        user = get_object_or_404(
+            User.objects.defer('search_vector'), pk=user_id
+        )
+        serializer = AdminUserUpdateSerializer(
+            user,
+            data=request.data,
+            partial=True
+        )
+        if serializer.is_valid():
+            serializer.save()
+            # to_representation délègue au sérialiseur de détail: une
+            # seule passe de sérialisation
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -542,8 +594,27 @@ class UserViewSet(viewsets.ModelViewSet):
     
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    permission_classes = [IsAuthenticated, IsAdmin]
-    
+    # IsAdmin vérifie déjà l'authentification: une seule classe
+    # de permission à instancier et exécuter par requête
+    permission_classes = [IsAdmin]
+
+    def get_queryset(self):
+        """
+        Retourne le queryset adapté à l'action.
+
+        La liste ne charge que les colonnes du sérialiseur de liste; les
+        actions de détail diffèrent le vecteur de recherche (jamais
+        sérialisé). Le modèle User n'a pas de clé étrangère propre: aucun
+        select_related n'est nécessaire tant que les sérialiseurs ne
+        suivent pas de relation.
+
+        Returns:
+            QuerySet: Le queryset restreint aux colonnes utiles
+        """
+        if self.action == 'list':
+            return User.objects.only(*_USER_LIST_FIELDS)
+        return User.objects.defer('search_vector')
+
     def get_serializer_class(self):
         """
         Retourne le sérialiseur approprié selon l'action.
@@ -567,9 +638,9 @@ class UserViewSet(viewsets.ModelViewSet):
             list: Liste de permissions
         """
         if self.action in ['create', 'list']:
-            permission_classes = [IsAuthenticated, IsAdmin]
+            permission_classes = [IsAdmin]
         elif self.action in ['retrieve', 'update', 'partial_update', 'destroy']:
-            permission_classes = [IsAuthenticated, IsAdmin]
+            permission_classes = [IsAdmin]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
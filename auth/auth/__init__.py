@@ -0,0 +1,9 @@
+"""
+Initialisation du projet.
+Expose l'application Celery pour que les tâches partagées soient
+enregistrées au démarrage de Django.
+"""
+
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
@@ -0,0 +1,20 @@
+"""
+Configuration Celery du projet.
+Les tâches lentes (envoi d'emails notamment) sont exécutées par des
+workers dédiés plutôt que dans le cycle requête/réponse.
+"""
+
+import os
+
+from celery import Celery
+
+# Définir le module de configuration Django par défaut pour Celery
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'auth.settings')
+
+app = Celery('auth')
+
+# Charger la configuration depuis settings.py (clés préfixées CELERY_)
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Découvrir automatiquement les tasks.py des applications installées
+app.autodiscover_tasks()
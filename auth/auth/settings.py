@@ -72,8 +72,6 @@ TEMPLATES = [
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         # Répertoires de templates
         'DIRS': [TEMPLATES_DIR],
-        # Chercher les templates dans les applications
-        'APP_DIRS': True,
         # Options de configuration
         'OPTIONS': {
             'context_processors': [
@@ -82,6 +80,16 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Chargeur avec cache: chaque template n'est lu et compilé
+            # qu'une fois par processus (y compris en DEBUG), au lieu
+            # d'un stat + parse à chaque rendu. Remplace APP_DIRS
+            # (incompatible avec une liste de loaders explicite).
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -103,6 +111,13 @@ if 'postgresql' in DB_ENGINE:
             'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
             'HOST': os.getenv('DB_HOST', 'localhost'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            # Connexions persistantes: amortit la poignée de main
+            # TCP + authentification PostgreSQL (~5-30 ms) sur
+            # plusieurs requêtes au lieu d'ouvrir une connexion par
+            # requête. Le contrôle de santé écarte les connexions
+            # mortes avant réutilisation.
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 else:
@@ -149,6 +164,18 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# ==================== Hachage des mots de passe ====================
+# bcrypt(SHA-256) en premier: coût calibré (~250-300ms) sur le budget de
+# latence de la connexion. Les hacheurs suivants restent déclarés pour
+# vérifier les mots de passe existants; Django re-hache automatiquement
+# vers le premier hacheur à la prochaine connexion réussie.
+PASSWORD_HASHERS = [
+    'app.accounts.hashers.TunedBCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 # ==================== Internationalisation ====================
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -166,9 +193,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ==================== Configuration Django REST Framework ====================
 REST_FRAMEWORK = {
     # Classes d'authentification par défaut
+    # La variante allégée diffère les colonnes larges du profil (bio,
+    # address, avatar) inutiles aux vérifications de permissions.
+    # JWT uniquement: SessionAuthentication coûtait une requête sur la
+    # table des sessions et une vérification CSRF par requête
+    # authentifiée, alors que l'API est purement JWT. L'admin Django
+    # (/admin/) conserve son authentification par session native.
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'app.accounts.authentication.LightweightJWTAuthentication',
     ],
     
     # Classes de permissions par défaut
@@ -177,13 +209,15 @@ REST_FRAMEWORK = {
     ],
     
     # Classes de rendu par défaut
+    # orjson (extension C) encode les payloads JSON — datetimes et UUID
+    # compris — plusieurs fois plus vite que le json de la stdlib
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
     ],
-    
+
     # Classes d'analyse par défaut
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'drf_orjson_renderer.parsers.ORJSONParser',
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ],
@@ -204,9 +238,11 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
     
     # Classes de limitation de débit
+    # Variantes atomiques: un incr par requête au lieu du cycle
+    # get/filtre/set sur une liste d'horodatages sérialisée
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'app.accounts.throttling.AtomicAnonRateThrottle',
+        'app.accounts.throttling.AtomicUserRateThrottle',
     ],
     
     # Taux de limitation de débit
@@ -239,8 +275,10 @@ SIMPLE_JWT = {
     # Algorithme de signature
     'ALGORITHM': 'HS256',
     
-    # Clé de signature (doit être sécurisée en production)
-    'SIGNING_KEY': SECRET_KEY,
+    # Clé de signature (doit être sécurisée en production).
+    # Encodée en bytes une seule fois au chargement: PyJWT n'a plus à
+    # ré-encoder la chaîne à chaque signature/vérification de token.
+    'SIGNING_KEY': SECRET_KEY.encode('utf-8'),
     
     # Clé de vérification (None utilise SIGNING_KEY)
     'VERIFYING_KEY': None,
@@ -290,11 +328,76 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@votredomaine.com')
 # URL du frontend pour les liens dans les emails
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
 
+# ==================== Documentation de l'API ====================
+# Exposition des pages Swagger/ReDoc: activée en développement, et en
+# production uniquement sur demande explicite (la génération du schéma
+# introspecte tous les sérialiseurs)
+ENABLE_API_DOCS = os.getenv('ENABLE_API_DOCS', str(DEBUG)) == 'True'
+
+SWAGGER_SETTINGS = {
+    # L'API est purement JWT: inutile de proposer la connexion par
+    # session dans l'interface Swagger
+    'USE_SESSION_AUTH': False,
+}
+
 # ==================== Configuration CORS ====================
 CORS_ALLOW_ALL_ORIGINS = DEBUG
-CORS_ALLOWED_ORIGINS = [origin for origin in os.getenv('CORS_ALLOWED_ORIGINS', '').split(',') if origin.strip()]
+# Liste blanche construite une fois à l'import: origines nettoyées
+# (espaces) et dédupliquées, triées pour un ordre stable. La
+# correspondance par origine reste un parcours linéaire dans
+# django-cors-headers — négligeable pour une liste courte; passer à
+# CORS_ALLOWED_ORIGIN_REGEXES avec une alternance pré-compilée si la
+# liste devait grossir.
+CORS_ALLOWED_ORIGINS = sorted({
+    origin.strip()
+    for origin in os.getenv('CORS_ALLOWED_ORIGINS', '').split(',')
+    if origin.strip()
+})
 CORS_ALLOW_CREDENTIALS = True
 
+# ==================== Cache ====================
+# Redis si REDIS_URL est défini (cache partagé entre les workers),
+# mémoire locale du processus sinon (développement)
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Durée de vie (secondes) du cache de l'utilisateur authentifié.
+# L'invalidation à la sauvegarde rend un TTL généreux sans risque.
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 300))
+
+# ==================== Celery ====================
+# File de tâches pour les envois d'emails (et autres travaux lents):
+# la vue répond sans attendre l'aller-retour SMTP. Réutilise Redis
+# comme broker quand il est disponible.
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', REDIS_URL or 'redis://localhost:6379/0')
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+# En développement/tests sans worker, exécuter les tâches en ligne
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', str(DEBUG)) == 'True'
+
+# ==================== Sessions ====================
+# L'API utilise des JWT, mais l'admin Django et l'authentification de
+# session passent encore par la table django_session. Avec Redis, les
+# sessions vivent entièrement en cache: un GET/SET mémoire remplace la
+# lecture/écriture PostgreSQL à chaque requête admin. Sans Redis, le
+# backend base de données (persistant entre redémarrages) est conservé.
+if REDIS_URL:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+    SESSION_CACHE_ALIAS = 'default'
+
 # ==================== Limitation de débit ====================
 RATE_LIMIT_ENABLED = not DEBUG
 RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', 100))
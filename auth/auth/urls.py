@@ -30,18 +30,34 @@ urlpatterns = [
     # Interface d'administration Django
     path('admin/', admin.site.urls),
     
-    # ==================== Documentation de l'API ====================
-    # Interface Swagger UI pour la documentation interactive
-    path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='api-docs'),
-    
-    # Interface ReDoc pour la documentation alternative
-    path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='api-redoc'),
-    
     # ==================== API d'authentification ====================
     # Inclure les URLs de l'application accounts
     path('api/v1/', include('app.accounts.urls')),
 ]
 
+# ==================== Documentation de l'API ====================
+# Exposée selon ENABLE_API_DOCS (activée en DEBUG). Le schéma généré est
+# mis en cache une heure: sa construction introspecte chaque sérialiseur
+# et ne doit pas être payée à chaque affichage. cache_timeout=0 en
+# développement pour refléter immédiatement les changements d'API.
+if settings.ENABLE_API_DOCS:
+    _docs_cache_timeout = 0 if settings.DEBUG else 3600
+    urlpatterns += [
+        # Interface Swagger UI pour la documentation interactive
+        path(
+            'api/docs/',
+            schema_view.with_ui('swagger', cache_timeout=_docs_cache_timeout),
+            name='api-docs',
+        ),
+
+        # Interface ReDoc pour la documentation alternative
+        path(
+            'api/redoc/',
+            schema_view.with_ui('redoc', cache_timeout=_docs_cache_timeout),
+            name='api-redoc',
+        ),
+    ]
+
 # Servir les fichiers médias en développement
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)